@@ -1,8 +1,14 @@
+import asyncio
+import logging
+import time
 import discord
 from discord.ext import commands
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict
-import pytz
+from functools import lru_cache
+from typing import Optional, Dict, FrozenSet, List, Tuple
+from zoneinfo import ZoneInfo
 
 from utils.scam_detector import ScamDetector
 from utils.logger import setup_logger
@@ -14,67 +20,329 @@ from config import Config
 logger = setup_logger(__name__)
 
 # Set timezone to Edmonton
-LOCAL_TZ = pytz.timezone('America/Edmonton')
+LOCAL_TZ = ZoneInfo('America/Edmonton')
+
+# Display format for timestamps in logs and the dataset
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S %Z"
+
+# Number of distinct (normalized) message texts whose detection results are cached
+DETECTION_CACHE_SIZE = 4096
+
+# Worker threads used to run model inference off the event loop
+DETECTION_WORKERS = 4
+
+# Pending messages allowed in the moderation queue before new ones are dropped
+MODERATION_QUEUE_SIZE = 512
+
+# Number of coroutines consuming the moderation queue
+MODERATION_WORKERS = 4
+
+# Discord's limit for an embed field value
+EMBED_FIELD_LIMIT = 1024
+
+# Seconds during which the same scam text from the same user is deleted without
+# sending another DM or log embed
+REPEAT_SCAM_TTL = 60
+
+# Static parts of the DM sent to users whose message was removed
+DM_NOTIFICATION_DESCRIPTION = (
+    "Your recent message in **{guild}** has been flagged by our automated "
+    "moderation system and removed."
+)
+DM_NOTIFICATION_TEMPLATE = {
+    'title': "⚠️ Message Flagged",
+    'color': discord.Color.orange().value,
+    'fields': [
+        {
+            'name': "What does this mean?",
+            'value': (
+                "Our system detected content that may violate server rules. "
+                "If you believe this was a mistake, please don't worry!"
+            ),
+            'inline': False
+        },
+        {
+            'name': "Was this a false alarm?",
+            'value': (
+                "Please contact the server moderators. "
+                "Your message has been logged, and if this was an error, "
+                "moderators can restore it immediately."
+            ),
+            'inline': False
+        }
+    ],
+    'footer': {'text': "Automated Security System"}
+}
+
+
+@lru_cache(maxsize=1)
+def _format_local_second(epoch_second: int) -> str:
+    """Format a whole epoch second in local time; detections in the same second reuse the result."""
+    return datetime.fromtimestamp(epoch_second, LOCAL_TZ).strftime(TIMESTAMP_FORMAT)
+
+
+def _format_now() -> str:
+    """Current local time formatted with TIMESTAMP_FORMAT."""
+    return _format_local_second(int(time.time()))
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Shorten text to at most limit characters, marking the cut with an ellipsis."""
+    if len(text) <= limit:
+        return text
+    return text[:limit - 3] + '...'
+
+
+def _normalize(text: str) -> str:
+    """Detection cache key for a message: lowercased with whitespace runs collapsed."""
+    return " ".join(text.split()).lower()
+
+
+def _user_repr(user: discord.abc.User) -> str:
+    """Display name#discriminator, omitting the "0" discriminator of migrated usernames."""
+    if user.discriminator == '0':
+        return user.name
+    return f"{user.name}#{user.discriminator}"
 
 
 class ModerationCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        
+        # Resolve the command prefix once; a callable prefix can't be checked
+        # without a message context, so commands are only skipped for static prefixes
+        prefix = bot.command_prefix
+        if isinstance(prefix, (list, tuple)):
+            prefix = tuple(prefix)
+        self._prefix = prefix if isinstance(prefix, (str, tuple)) else None
+        
         self.scam_detector = ScamDetector()
         self.dataset_logger = DatasetLogger()
-        self.stats_tracker = StatsTracker()
-        self.whitelisted_roles = ['Admin', 'Moderator', 'executive', 'chat revive ping']
+        self.stats_tracker = StatsTracker(self.dataset_logger)
+        
+        # Scam waves repost the same text many times, so memoize detection
+        # results instead of re-running the model. Keys are normalized so case and
+        # whitespace variants share an entry, but the model always sees the
+        # original text of the first message with that key (LRU order)
+        self._detect_cache: "OrderedDict[str, Tuple[bool, float, str]]" = OrderedDict()
+        
+        # Model inference is CPU-bound and synchronous; run it in a thread pool
+        # so the gateway connection keeps processing events during detection
+        self._executor = ThreadPoolExecutor(
+            max_workers=DETECTION_WORKERS,
+            thread_name_prefix="scam-detector"
+        )
+        
+        self.whitelisted_roles = frozenset({'Admin', 'Moderator', 'executive', 'chat revive ping'})
+        
+        # IDs of roles named in whitelisted_roles, per guild ID. Each guild's entry
+        # is replaced whenever that guild or one of its roles changes, and
+        # _whitelist_ids is their union, so on_message only compares integer IDs
+        self._guild_whitelist_ids: Dict[int, FrozenSet[int]] = {}
+        self._whitelist_ids: FrozenSet[int] = frozenset()
+        
+        # Moderator role per guild ID, resolved on first detection in that guild
+        self._mod_role_cache: Dict[int, Optional[discord.Role]] = {}
         
         # Store log messages for false alarm handling
-        # Format: {log_message_id: {'content': str, 'user': discord.User, 'channel': discord.Channel}}
+        # Format: {log_message_id: {'content': str, 'user': discord.User, 'user_repr': str, 'channel': discord.Channel}}
         self.flagged_messages: Dict[int, dict] = {}
         
+        # Messages awaiting detection; on_message only enqueues so the gateway
+        # handler returns immediately, and a fixed worker pool bounds concurrency
+        self._work_q: asyncio.Queue = asyncio.Queue(maxsize=MODERATION_QUEUE_SIZE)
+        self._dropped = 0
+        
+        # Scams already reported, keyed by (user ID, normalized content hash) -> time first handled,
+        # so a compromised account reposting the same text doesn't trigger a DM/log each time
+        self._recent: Dict[Tuple[int, int], float] = {}
+        self._suppressed_repeats = 0
+        
+        # Background tasks owned by the cog (queue workers, cache pruning)
+        self._tasks: List[asyncio.Task] = []
+        
+    async def cog_load(self):
+        """Start the dataset writer, stats flusher and the cog's background tasks."""
+        self.dataset_logger.start()
+        self.stats_tracker.start()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"moderation-worker-{i}")
+            for i in range(MODERATION_WORKERS)
+        ]
+        self._tasks.append(asyncio.create_task(self._prune_recent(), name="moderation-prune-recent"))
+        
+        # On a reload the guild events have already fired, so resolve roles now
+        if self.bot.is_ready():
+            self._refresh_whitelist_ids()
+    
+    async def cog_unload(self):
+        """Stop background tasks, flush the dataset and stats and release the detection thread pool."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        await self.dataset_logger.close()
+        await self.stats_tracker.close()
+        self._executor.shutdown(wait=False)
+    
     @commands.Cog.listener()
     async def on_ready(self):
-        logger.info(f'Moderation cog loaded. Monitoring messages...')
+        logger.info('Moderation cog loaded. Monitoring messages...')
+    
+    def _resolve_guild_whitelist(self, guild: discord.Guild):
+        """Store the IDs of the roles in one guild whose names are in whitelisted_roles."""
+        self._guild_whitelist_ids[guild.id] = frozenset(
+            role.id for role in guild.roles if role.name in self.whitelisted_roles
+        )
+    
+    def _rebuild_whitelist_ids(self):
+        """Recompute the combined whitelist from the per-guild entries."""
+        self._whitelist_ids = frozenset().union(*self._guild_whitelist_ids.values())
+    
+    def _refresh_guild_whitelist(self, guild: discord.Guild):
+        """Re-resolve one guild's whitelisted roles, replacing any stale entry."""
+        self._resolve_guild_whitelist(guild)
+        self._rebuild_whitelist_ids()
+        logger.info(
+            "Resolved %d whitelisted role(s) in %s",
+            len(self._guild_whitelist_ids[guild.id]), guild.name
+        )
+    
+    def _refresh_whitelist_ids(self):
+        """Resolve whitelisted role names to role IDs for all guilds."""
+        self._guild_whitelist_ids = {}
+        for guild in self.bot.guilds:
+            self._resolve_guild_whitelist(guild)
+        self._rebuild_whitelist_ids()
+        logger.info("Resolved %d whitelisted role(s)", len(self._whitelist_ids))
+    
+    # Guild and role events only rescan the guild concerned
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        self._refresh_guild_whitelist(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        self._refresh_guild_whitelist(guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._mod_role_cache.pop(guild.id, None)
+        if self._guild_whitelist_ids.pop(guild.id, None) is not None:
+            self._rebuild_whitelist_ids()
+    
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role):
+        if role.name in self.whitelisted_roles:
+            self._refresh_guild_whitelist(role.guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._mod_role_cache.pop(after.guild.id, None)
+        
+        # A rename can move a role into or out of the whitelist
+        if before.name != after.name:
+            self._refresh_guild_whitelist(after.guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role):
+        self._mod_role_cache.pop(role.guild.id, None)
+        
+        guild_ids = self._guild_whitelist_ids.get(role.guild.id)
+        if guild_ids is not None and role.id in guild_ids:
+            self._guild_whitelist_ids[role.guild.id] = guild_ids - {role.id}
+            self._rebuild_whitelist_ids()
+    
+    def _get_mod_role(self, guild: discord.Guild) -> Optional[discord.Role]:
+        """Return the configured moderator role for a guild, cached per guild."""
+        if guild.id not in self._mod_role_cache:
+            self._mod_role_cache[guild.id] = guild.get_role(Config.MODERATOR_ROLE_ID)
+        return self._mod_role_cache[guild.id]
     
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """Monitor all messages for scam content."""
         
-        logger.info(f"[DEBUG] Received message from {message.author.name}: {message.content[:80]}")
+        logger.debug("Received message from %s: %.80s", message.author.name, message.content)
         
         # Ignore bot messages
         if message.author.bot:
-            logger.info("[DEBUG] Ignoring bot message")
+            logger.debug("Ignoring bot message")
             return
         
         # Ignore commands
-        if message.content.startswith(self.bot.command_prefix):
-            logger.info("[DEBUG] Ignoring command")
+        if self._prefix and message.content.startswith(self._prefix):
             return
         
         # Check if user has whitelisted role
         if isinstance(message.author, discord.Member):
-            user_roles = [role.name for role in message.author.roles]
-            logger.info(f"[DEBUG] User roles: {user_roles}")
-            if any(role in self.whitelisted_roles for role in user_roles):
-                logger.info("[DEBUG] User has whitelisted role, skipping")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("User roles: %s", [role.name for role in message.author.roles])
+            if not self._whitelist_ids.isdisjoint(role.id for role in message.author.roles):
+                logger.debug("User has whitelisted role, skipping")
                 return
         
+        # Short or letter-free messages ("lol", emoji, attachment-only) are not
+        # worth a model call
+        content = message.content
+        if len(content) < Config.MIN_DETECT_LEN or not any(c.isalpha() for c in content):
+            logger.debug("Message too short or has no text, skipping")
+            return
+        
+        # Hand off to the worker pool; drop rather than block when saturated
+        try:
+            self._work_q.put_nowait(message)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            logger.warning(
+                "Moderation queue full, dropped message %s (%d dropped in total)",
+                message.id, self._dropped
+            )
+    
+    async def _worker(self):
+        """Consume queued messages and run them through detection."""
+        
+        while True:
+            message = await self._work_q.get()
+            try:
+                await self._process(message)
+            finally:
+                self._work_q.task_done()
+    
+    async def _prune_recent(self):
+        """Periodically forget repeat-scam entries older than REPEAT_SCAM_TTL."""
+        
+        while True:
+            await asyncio.sleep(REPEAT_SCAM_TTL)
+            cutoff = time.monotonic() - REPEAT_SCAM_TTL
+            self._recent = {key: seen for key, seen in self._recent.items() if seen >= cutoff}
+    
+    async def _process(self, message: discord.Message):
+        """Analyze a single message and handle it if it is a scam."""
+        
         # Increment messages analyzed counter
         self.stats_tracker.increment_analyzed()
         
         try:
-            logger.info(f"[DEBUG] Analyzing message: {message.content[:100]}")
-            # Detect scam
-            is_scam, confidence, reason = self.scam_detector.detect(message.content)
-            logger.info(f"[DEBUG] Detection result: is_scam={is_scam}, confidence={confidence:.2%}, reason={reason}")
+            logger.debug("Analyzing message: %.100s", message.content)
+            # Normalize once: the same key drives detection caching and repeat suppression
+            content_key = _normalize(message.content)
+            is_scam, confidence, reason = await self._detect(message.content, content_key)
+            logger.debug(
+                "Detection result: is_scam=%s, confidence=%.2f%%, reason=%s",
+                is_scam, confidence * 100, reason
+            )
             
             if is_scam:
-                logger.warning(f"[SCAM DETECTED] Processing message from {message.author.name}")
+                logger.warning("[SCAM DETECTED] Processing message from %s", message.author.name)
                 self.stats_tracker.increment_flagged()
-                await self._handle_scam_message(message, confidence, reason)
+                await self._handle_scam_message(message, confidence, reason, content_key)
             else:
-                logger.info("[DEBUG] Message is clean")
+                logger.debug("Message is clean")
                 
         except Exception as e:
-            logger.error(f"Error processing message: {e}", exc_info=True)
+            logger.error("Error processing message: %s", e, exc_info=True)
     
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
@@ -97,58 +365,124 @@ class ModerationCog(commands.Cog):
             # Handle false alarm
             await self._handle_false_alarm(reaction.message, user)
     
+    async def _detect(self, text: str, key: Optional[str] = None) -> Tuple[bool, float, str]:
+        """
+        Run scam detection in the thread pool, reusing cached results for repeated texts.
+        
+        Args:
+            text: Original message text, passed to the detector unchanged
+            key: _normalize(text), if the caller already computed it
+        """
+        
+        # The cache is only touched on the event loop, so it needs no locking
+        if key is None:
+            key = _normalize(text)
+        cached = self._detect_cache.get(key)
+        if cached is not None:
+            self._detect_cache.move_to_end(key)
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(self._executor, self.scam_detector.detect, text)
+        
+        self._detect_cache[key] = result
+        if len(self._detect_cache) > DETECTION_CACHE_SIZE:
+            self._detect_cache.popitem(last=False)
+        return result
+    
     async def _handle_scam_message(
         self, 
         message: discord.Message, 
         confidence: float, 
-        reason: str
+        reason: str,
+        content_key: str
     ):
-        """Handle detected scam message."""
+        """
+        Handle detected scam message.
+        
+        Args:
+            message: The flagged message
+            confidence: Detection confidence score (0.0 to 1.0)
+            reason: Reason for detection
+            content_key: _normalize(message.content), so case/whitespace variants
+                of an already reported scam count as repeats
+        """
         
         member = message.author
         guild = message.guild
         original_channel = message.channel
         original_content = message.content
+        # Truncated once and shared by the log embed and the false-alarm restore embed
+        display_content = _truncate(original_content, EMBED_FIELD_LIMIT) or "*No content*"
+        user_repr = _user_repr(member)
         
         # Store original message time in Edmonton timezone
-        message_sent_time = message.created_at.astimezone(LOCAL_TZ).strftime("%Y-%m-%d %H:%M:%S %Z")
+        message_sent_time = message.created_at.astimezone(LOCAL_TZ).strftime(TIMESTAMP_FORMAT)
+        detected_at = _format_now()
         
         logger.warning(
-            f"Scam detected from {member.name}#{member.discriminator} "
-            f"({member.id}) with confidence {confidence:.2%} at {message_sent_time}"
+            "Scam detected from %s (%s) with confidence %.2f%% at %s",
+            user_repr, member.id, confidence * 100, message_sent_time
         )
         
         # Get join date
         joined_at = "Unknown"
         if isinstance(member, discord.Member) and member.joined_at:
-            joined_at = member.joined_at.astimezone(LOCAL_TZ).strftime("%Y-%m-%d %H:%M:%S %Z")
+            joined_at = member.joined_at.astimezone(LOCAL_TZ).strftime(TIMESTAMP_FORMAT)
         
         # Log to CSV dataset BEFORE deleting (in case deletion fails)
         logger.info("[DATASET] Logging flagged message to CSV dataset")
-        self.dataset_logger.log_flagged_message(message, confidence, reason, joined_at)
+        self.dataset_logger.log_flagged_message(message, confidence, reason, joined_at, detected_at)
         
         # Delete the message
         try:
             await message.delete()
-            logger.info(f"Deleted scam message from {member.name}")
+            logger.info("Deleted scam message from %s", user_repr)
         except discord.errors.Forbidden:
             logger.error("Bot lacks permission to delete messages")
             return
         except Exception as e:
-            logger.error(f"Error deleting message: {e}")
+            logger.error("Error deleting message: %s", e)
             return
         
-        # Send DM notification to the user
-        await self._send_user_notification(member, guild)
+        # Repeats of a scam already reported for this user are only deleted
+        repeat_key = (member.id, hash(content_key))
+        now = time.monotonic()
+        first_seen = self._recent.get(repeat_key)
+        if first_seen is not None and now - first_seen < REPEAT_SCAM_TTL:
+            self._suppressed_repeats += 1
+            logger.info(
+                "Repeat scam from %s deleted without notification (%d suppressed in total)",
+                user_repr, self._suppressed_repeats
+            )
+            return
+        self._recent[repeat_key] = now
+        
+        # Notify the user and post the log concurrently; they are independent REST calls
+        dm_result, log_result = await asyncio.gather(
+            self._send_user_notification(member, guild),
+            self._send_log(
+                message, member, user_repr, display_content,
+                joined_at, confidence, reason, message_sent_time, detected_at
+            ),
+            return_exceptions=True
+        )
+        
+        if isinstance(dm_result, BaseException):
+            logger.error("Error sending DM notification to %s: %s", user_repr, dm_result)
         
-        # Send log to private channel and store for false alarm handling
-        log_message_id = await self._send_log(message, member, joined_at, confidence, reason, message_sent_time)
+        log_message_id = None
+        if isinstance(log_result, BaseException):
+            logger.error("Error sending log: %s", log_result)
+        else:
+            log_message_id = log_result
         
         # Store message data for potential restoration
         if log_message_id:
             self.flagged_messages[log_message_id] = {
-                'content': original_content,
+                'content': display_content,
                 'user': member,
+                'user_repr': user_repr,
                 'channel': original_channel,
                 'confidence': confidence,
                 'reason': reason
@@ -165,7 +499,7 @@ class ModerationCog(commands.Cog):
             
             original_user = message_data['user']
             original_channel = message_data['channel']
-            original_content = message_data['content']
+            display_content = message_data['content']
             
             # Increment false alarm counter
             self.stats_tracker.increment_false_alarm()
@@ -183,13 +517,13 @@ class ModerationCog(commands.Cog):
             
             restore_embed.add_field(
                 name="Original User",
-                value=f"{original_user.mention} ({original_user.name}#{original_user.discriminator})",
+                value=f"{original_user.mention} ({message_data['user_repr']})",
                 inline=False
             )
             
             restore_embed.add_field(
                 name="Message Content",
-                value=original_content[:1024] if original_content else "*No content*",
+                value=display_content,
                 inline=False
             )
             
@@ -198,9 +532,9 @@ class ModerationCog(commands.Cog):
             # Send restored message to original channel
             try:
                 await original_channel.send(embed=restore_embed)
-                logger.info(f"[FALSE ALARM] Restored message to {original_channel.name}")
+                logger.info("[FALSE ALARM] Restored message to %s", original_channel.name)
             except discord.errors.Forbidden:
-                logger.error(f"[FALSE ALARM] Cannot send to {original_channel.name} - missing permissions")
+                logger.error("[FALSE ALARM] Cannot send to %s - missing permissions", original_channel.name)
             
             # Update the log message to show it was a false alarm
             updated_embed = log_message.embeds[0]
@@ -218,7 +552,7 @@ class ModerationCog(commands.Cog):
                     f"**Reported by:** {moderator.mention}\n"
                     f"**Original User:** {original_user.mention}\n"
                     f"**Message restored to:** {original_channel.mention}\n"
-                    f"**Total False Alarms:** {self.stats_tracker.overall_stats['total_false_alarms']}"
+                    f"**Total False Alarms:** {self.stats_tracker.total_false_alarms}"
                 ),
                 color=discord.Color.green(),
                 timestamp=datetime.now(LOCAL_TZ)
@@ -229,114 +563,85 @@ class ModerationCog(commands.Cog):
             # Remove from tracking
             del self.flagged_messages[log_message.id]
             
-            logger.info(f"[FALSE ALARM] Processed by {moderator.name} for message from {original_user.name}")
+            logger.info("[FALSE ALARM] Processed by %s for message from %s", moderator.name, original_user.name)
             
         except Exception as e:
-            logger.error(f"[FALSE ALARM] Error handling false alarm: {e}", exc_info=True)
+            logger.error("[FALSE ALARM] Error handling false alarm: %s", e, exc_info=True)
             await moderator.send(f"❌ Error processing false alarm: {e}")
     
     async def _send_user_notification(self, member: discord.Member, guild: discord.Guild):
         """Send a DM notification to the user whose message was flagged."""
         
         try:
-            embed = discord.Embed(
-                title="⚠️ Message Flagged",
-                description=(
-                    f"Your recent message in **{guild.name}** has been flagged by our automated "
-                    "moderation system and removed."
-                ),
-                color=discord.Color.orange()
-            )
-            
-            embed.add_field(
-                name="What does this mean?",
-                value=(
-                    "Our system detected content that may violate server rules. "
-                    "If you believe this was a mistake, please don't worry!"
-                ),
-                inline=False
-            )
-            
-            embed.add_field(
-                name="Was this a false alarm?",
-                value=(
-                    "Please contact the server moderators. "
-                    "Your message has been logged, and if this was an error, "
-                    "moderators can restore it immediately."
-                ),
-                inline=False
-            )
-            
-            embed.set_footer(text="Automated Security System")
+            # Only the guild name varies between notifications. The template's
+            # fields list is shared, which is fine since the embed is never edited
+            embed = discord.Embed.from_dict({
+                **DM_NOTIFICATION_TEMPLATE,
+                'description': DM_NOTIFICATION_DESCRIPTION.format(guild=guild.name)
+            })
             
             await member.send(embed=embed)
-            logger.info(f"Successfully sent DM notification to {member.name}")
+            logger.info("Successfully sent DM notification to %s", member.name)
             
         except discord.errors.Forbidden:
             logger.warning(
                 f"Could not send DM to {member.name} (DMs disabled or bot blocked)"
             )
         except Exception as e:
-            logger.error(f"Error sending DM notification to {member.name}: {e}", exc_info=True)
+            logger.error("Error sending DM notification to %s: %s", member.name, e, exc_info=True)
     
     async def _send_log(
         self,
         message: discord.Message,
         member: discord.Member,
+        user_repr: str,
+        display_content: str,
         joined_at: str,
         confidence: float,
         reason: str,
-        message_sent_time: str
+        message_sent_time: str,
+        detected_at: str
     ) -> Optional[int]:
         """Send log to the private logging channel. Returns log message ID."""
         
         log_channel = self.bot.get_channel(Config.LOG_CHANNEL_ID)
         
         if not log_channel:
-            logger.error(f"Log channel {Config.LOG_CHANNEL_ID} not found")
+            logger.error("Log channel %s not found", Config.LOG_CHANNEL_ID)
             return None
         
         try:
-            detected_at = datetime.now(LOCAL_TZ).strftime("%Y-%m-%d %H:%M:%S %Z")
-            
-            embed = discord.Embed(
-                title="🚨 Scam Message Deleted",
-                description="React with ❌ to mark as false alarm and restore message",
-                color=discord.Color.red(),
-                timestamp=datetime.now(LOCAL_TZ)
-            )
-            
-            embed.add_field(
-                name="User",
-                value=f"{member.mention} ({member.name}#{member.discriminator})",
-                inline=False
-            )
-            embed.add_field(name="User ID", value=str(member.id), inline=True)
-            embed.add_field(name="Joined Server", value=joined_at, inline=True)
-            embed.add_field(name="Detection Method", value=reason, inline=False)
-            embed.add_field(name="Confidence", value=f"{confidence:.2%}", inline=True)
-            embed.add_field(name="Channel", value=message.channel.mention, inline=True)
-            
-            embed.add_field(name="Message Sent", value=message_sent_time, inline=True)
-            embed.add_field(name="Detected At", value=detected_at, inline=True)
-            
-            embed.add_field(
-                name="Message Content",
-                value=message.content[:1024] if message.content else "*No content*",
-                inline=False
-            )
+            # Assemble the whole embed in one payload rather than ~9 add_field calls
+            payload = {
+                'title': "🚨 Scam Message Deleted",
+                'description': "React with ❌ to mark as false alarm and restore message",
+                'color': discord.Color.red().value,
+                'timestamp': datetime.now(LOCAL_TZ).isoformat(),
+                'fields': [
+                    {'name': "User", 'value': f"{member.mention} ({user_repr})", 'inline': False},
+                    {'name': "User ID", 'value': str(member.id), 'inline': True},
+                    {'name': "Joined Server", 'value': joined_at, 'inline': True},
+                    {'name': "Detection Method", 'value': reason, 'inline': False},
+                    {'name': "Confidence", 'value': f"{confidence:.2%}", 'inline': True},
+                    {'name': "Channel", 'value': message.channel.mention, 'inline': True},
+                    {'name': "Message Sent", 'value': message_sent_time, 'inline': True},
+                    {'name': "Detected At", 'value': detected_at, 'inline': True},
+                    {'name': "Message Content", 'value': display_content, 'inline': False}
+                ],
+                'footer': {'text': "User notified via DM | Logged to training dataset"}
+            }
             
             if member.avatar:
-                embed.set_thumbnail(url=member.avatar.url)
+                payload['thumbnail'] = {'url': member.avatar.url}
             
-            embed.set_footer(text="User notified via DM | Logged to training dataset")
+            embed = discord.Embed.from_dict(payload)
             
-            mod_role = message.guild.get_role(Config.MODERATOR_ROLE_ID)
+            mod_role = self._get_mod_role(message.guild)
             
             if mod_role:
                 content = f"{mod_role.mention} Spam detected!"
             else:
-                logger.warning(f"Moderator role {Config.MODERATOR_ROLE_ID} not found")
+                logger.warning("Moderator role %s not found", Config.MODERATOR_ROLE_ID)
                 content = "Spam detected!"
             
             log_message = await log_channel.send(content=content, embed=embed)
@@ -344,12 +649,12 @@ class ModerationCog(commands.Cog):
             # Add reaction for false alarm reporting
             await log_message.add_reaction("❌")
             
-            logger.info(f"Sent log to channel {log_channel.name}")
+            logger.info("Sent log to channel %s", log_channel.name)
             
             return log_message.id
             
         except Exception as e:
-            logger.error(f"Error sending log: {e}", exc_info=True)
+            logger.error("Error sending log: %s", e, exc_info=True)
             return None
     
     @commands.command(name='check')
@@ -357,7 +662,7 @@ class ModerationCog(commands.Cog):
     async def check_message(self, ctx: commands.Context, *, text: str):
         """Manually check if a message is a scam (Admin only)."""
         
-        is_scam, confidence, reason = self.scam_detector.detect(text)
+        is_scam, confidence, reason = await self._detect(text)
         
         embed = discord.Embed(
             title="Scam Detection Result",
@@ -367,7 +672,7 @@ class ModerationCog(commands.Cog):
         embed.add_field(name="Is Scam?", value="Yes" if is_scam else "No", inline=True)
         embed.add_field(name="Confidence", value=f"{confidence:.2%}", inline=True)
         embed.add_field(name="Reason", value=reason or "N/A", inline=False)
-        embed.add_field(name="Tested Message", value=text[:1024], inline=False)
+        embed.add_field(name="Tested Message", value=_truncate(text, EMBED_FIELD_LIMIT), inline=False)
         
         await ctx.send(embed=embed)
     
@@ -474,7 +779,7 @@ class ModerationCog(commands.Cog):
     async def dataset_info(self, ctx: commands.Context):
         """Show detailed information about the training dataset (Admin only)."""
         
-        stats = DatasetLogger.get_dataset_stats()
+        stats = self.stats_tracker.get_dataset_stats()
         
         if not stats['exists']:
             await ctx.send("❌ No dataset file found yet. Start flagging messages to build the dataset!")
@@ -582,9 +887,7 @@ class ModerationCog(commands.Cog):
             if str(reaction.emoji) == "✅":
                 # Perform the clear operation
                 if scope == 'session':
-                    self.stats_tracker.session_start_time = datetime.now(LOCAL_TZ)
-                    self.stats_tracker.session_messages_analyzed = 0
-                    self.stats_tracker.session_messages_flagged = 0
+                    self.stats_tracker.reset_session()
                     
                     result_embed = discord.Embed(
                         title="✅ Session Stats Cleared",
@@ -593,14 +896,7 @@ class ModerationCog(commands.Cog):
                     )
                     
                 elif scope == 'overall':
-                    self.stats_tracker.overall_stats = {
-                        'total_messages_analyzed': 0,
-                        'total_messages_flagged': 0,
-                        'total_false_alarms': 0,
-                        'first_started': datetime.now(LOCAL_TZ).isoformat(),
-                        'last_updated': datetime.now(LOCAL_TZ).isoformat()
-                    }
-                    self.stats_tracker._save_overall_stats()
+                    self.stats_tracker.reset_overall()
                     
                     result_embed = discord.Embed(
                         title="✅ Overall Stats Cleared",
@@ -610,19 +906,10 @@ class ModerationCog(commands.Cog):
                     
                 else:  # all
                     # Clear session
-                    self.stats_tracker.session_start_time = datetime.now(LOCAL_TZ)
-                    self.stats_tracker.session_messages_analyzed = 0
-                    self.stats_tracker.session_messages_flagged = 0
+                    self.stats_tracker.reset_session()
                     
                     # Clear overall
-                    self.stats_tracker.overall_stats = {
-                        'total_messages_analyzed': 0,
-                        'total_messages_flagged': 0,
-                        'total_false_alarms': 0,
-                        'first_started': datetime.now(LOCAL_TZ).isoformat(),
-                        'last_updated': datetime.now(LOCAL_TZ).isoformat()
-                    }
-                    self.stats_tracker._save_overall_stats()
+                    self.stats_tracker.reset_overall()
                     
                     result_embed = discord.Embed(
                         title="✅ All Stats Cleared",
@@ -637,7 +924,7 @@ class ModerationCog(commands.Cog):
                 )
                 
                 await ctx.send(embed=result_embed)
-                logger.info(f"[STATS] {scope.upper()} stats cleared by {ctx.author.name}")
+                logger.info("[STATS] %s stats cleared by %s", scope.upper(), ctx.author.name)
                 
             else:
                 await ctx.send("❌ Stats clear cancelled. No changes made.")
@@ -721,7 +1008,7 @@ class ModerationCog(commands.Cog):
         if show_all:
             whitelist_info = (
                 f"Users with these roles bypass spam detection:\n"
-                f"• {', '.join(self.whitelisted_roles)}\n\n"
+                f"• {', '.join(sorted(self.whitelisted_roles))}\n\n"
                 "These roles are set in the bot configuration."
             )
             
@@ -10,8 +10,11 @@ class Config:
     
     MODEL_NAME = os.getenv('MODEL_NAME', 'mrm8488/bert-tiny-finetuned-sms-spam-detection')
     SCAM_THRESHOLD = float(os.getenv('SCAM_THRESHOLD', 0.85))
+    # Messages shorter than this (or with no letters at all) skip detection
+    MIN_DETECT_LEN = int(os.getenv('MIN_DETECT_LEN', 10))
     
     ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG' if ENVIRONMENT == 'development' else 'WARNING').upper()
     
     @classmethod
     def validate(cls):
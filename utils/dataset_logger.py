@@ -1,80 +1,319 @@
+import asyncio
+import atexit
 import csv
+import json
+import os
+from collections import Counter
 from pathlib import Path
-from datetime import datetime
 from threading import Lock
-from typing import Optional
+from typing import IO, List, Optional
 import discord
-import pytz
 
 from utils.logger import setup_logger
 
 # Initialize logger
 logger = setup_logger(__name__)
 
-# Set timezone to Edmonton
-LOCAL_TZ = pytz.timezone('America/Edmonton')
-
 # CSV file path for flagged messages dataset
 FLAGGED_MESSAGES_CSV = Path("data/flagged_messages_dataset.csv")
 CSV_LOCK = Lock()  # Thread-safe file writing
 
+# Sidecar file holding running dataset statistics so they never need a full CSV scan
+DATASET_STATS_FILE = Path("data/flagged_messages_dataset.stats.json")
+
+CSV_HEADERS = [
+    'timestamp',
+    'user_id',
+    'username',
+    'user_discriminator',
+    'guild_id',
+    'guild_name',
+    'channel_id',
+    'channel_name',
+    'message_content',
+    'confidence',
+    'detection_reason',
+    'user_joined_at',
+    'message_id'
+]
+REASON_COLUMN = CSV_HEADERS.index('detection_reason')
+
+# Longest message content stored per row, to cap CSV growth from huge pastes
+MAX_CONTENT_LENGTH = 4096
+
+# Rows that may wait in memory for the background writer before new ones are dropped
+WRITE_QUEUE_SIZE = 1024
+
+# Maximum number of rows written to the CSV in a single batch
+WRITE_BATCH_SIZE = 100
+
+# Queued by close() to tell the writer to finish its batch and exit
+_STOP = object()
+
+# Row template producing the same output as csv.writer(quoting=csv.QUOTE_ALL) for
+# the fixed schema. Embedded newlines are valid inside quoted fields and left as is
+_ROW_FMT = ",".join(['"{}"'] * len(CSV_HEADERS)) + "\r\n"
+
+
+def _format_row(row: list) -> str:
+    """Render one dataset row as a fully quoted CSV line."""
+    return _ROW_FMT.format(*[str(value).replace('"', '""') for value in row])
+
 
 class DatasetLogger:
     """Handles logging of flagged messages to CSV for training dataset."""
     
     def __init__(self):
         """Initialize the dataset logger."""
-        self._initialize_csv()
+        # Running stats, updated by the writer under CSV_LOCK, plus an immutable
+        # snapshot of them (_stats_snapshot) that get_stats() can return lock-free
+        with CSV_LOCK:
+            self._dataset_stats = self._initialize_csv()
+            self._publish_stats()
+        
+        # Persistent append handle, so each batch costs a write instead of open/close
+        self._fh: Optional[IO[str]] = None
+        self._open_csv()
+        
+        # Rows are queued and written in batches by a background task once
+        # start() is called; until then they are written synchronously
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._dropped = 0
+    
+    def start(self):
+        """Start the background task that writes queued rows to the CSV."""
+        if self._writer_task is not None:
+            return
+        
+        self._queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer_task = asyncio.create_task(self._write_loop(), name="dataset-writer")
+        logger.info("[CSV] Background dataset writer started")
+    
+    async def close(self):
+        """Stop the background writer and flush any rows still queued."""
+        if self._writer_task is None:
+            return
+        
+        # Let the writer finish on its own rather than cancelling it: a cancelled
+        # run_in_executor job would still run later, after the handle is closed
+        if not self._writer_task.done():
+            await self._queue.put(_STOP)
+        await asyncio.gather(self._writer_task, return_exceptions=True)
+        self._writer_task = None
+        
+        # Rows queued behind the sentinel (or left over if the writer died)
+        remaining = [row for row in self._drain_queue([]) if row is not _STOP]
+        self._queue = None
+        if remaining:
+            self._write_rows(remaining)
+        
+        with CSV_LOCK:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        logger.info("[CSV] Background dataset writer stopped")
     
-    def _initialize_csv(self):
-        """Initialize the CSV file with headers if it doesn't exist."""
+    def _open_csv(self):
+        """Open the persistent append handle used for all dataset writes."""
+        try:
+            self._fh = open(FLAGGED_MESSAGES_CSV, 'a', encoding='utf-8', newline='', buffering=8192)
+            atexit.register(self._fh.close)
+        except Exception as e:
+            logger.error("[CSV] Error opening dataset file for writing: %s", e, exc_info=True)
+    
+    async def _write_loop(self):
+        """Wait for queued rows and write everything pending in one batch, until _STOP."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            # Block until at least one row arrives, then take whatever else is
+            # already queued so bursts are flushed together
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            
+            batch = self._drain_queue([first])
+            stopping = batch[-1] is _STOP
+            if stopping:
+                batch.pop()
+            if batch:
+                await loop.run_in_executor(None, self._write_rows, batch)
+            if stopping:
+                return
+    
+    def _drain_queue(self, batch: List[list]) -> List[list]:
+        """Move queued rows into batch without waiting, up to WRITE_BATCH_SIZE or _STOP."""
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                row = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            batch.append(row)
+            if row is _STOP:
+                break
+        return batch
+    
+    def _write_rows(self, rows: List[list]):
+        """Append rows to the CSV dataset in a single write."""
+        try:
+            # Thread-safe write to CSV
+            with CSV_LOCK:
+                logger.debug("[CSV] Acquired file lock, writing %d row(s) to %s", len(rows), FLAGGED_MESSAGES_CSV)
+                if self._fh is None:
+                    self._open_csv()
+                
+                # A CSV deleted or rotated away while the bot runs leaves the handle
+                # appending to an unlinked file; start a fresh one at the path instead
+                file_stat = os.fstat(self._fh.fileno())
+                if file_stat.st_nlink == 0:
+                    logger.warning("[CSV] %s was removed, recreating it", FLAGGED_MESSAGES_CSV)
+                    self._fh.close()
+                    self._dataset_stats = self._initialize_csv()
+                    self._open_csv()
+                    file_stat = os.fstat(self._fh.fileno())
+                
+                # The handle is flushed after every batch, so the on-disk size only
+                # differs from the running stats if the CSV was changed externally
+                stats = self._dataset_stats
+                in_step = file_stat.st_size == stats['file_size']
+                
+                self._fh.write("".join(_format_row(row) for row in rows))
+                self._fh.flush()
+                logger.info("[CSV] Successfully logged %d message(s) to dataset", len(rows))
+                
+                # Keep the sidecar stats in step with the rows just written
+                if in_step:
+                    methods = stats['detection_methods']
+                    for row in rows:
+                        reason = row[REASON_COLUMN]
+                        methods[reason] = methods.get(reason, 0) + 1
+                    stats['total_messages'] += len(rows)
+                    stats['file_size'] = self._fh.tell()
+                else:
+                    logger.info("[CSV] %s changed outside the logger, rebuilding stats", FLAGGED_MESSAGES_CSV)
+                    stats = self._dataset_stats = self._rebuild_dataset_stats()
+                file_size = stats['file_size']
+                self._save_dataset_stats(stats)
+                self._publish_stats()
+            
+            # Log file size for monitoring
+            logger.debug("[CSV] Current dataset file size: %d bytes", file_size)
+            
+        except Exception as e:
+            logger.error("[CSV] Error logging to dataset: %s", e, exc_info=True)
+    
+    def _initialize_csv(self) -> dict:
+        """
+        Initialize the CSV file with headers if it doesn't exist.
+        
+        The caller must hold CSV_LOCK.
+        
+        Returns:
+            Running dataset statistics (total_messages, detection_methods, file_size)
+        """
         try:
             # Create data directory if it doesn't exist
             FLAGGED_MESSAGES_CSV.parent.mkdir(parents=True, exist_ok=True)
-            logger.info(f"[CSV] Data directory ensured at: {FLAGGED_MESSAGES_CSV.parent}")
+            logger.info("[CSV] Data directory ensured at: %s", FLAGGED_MESSAGES_CSV.parent)
             
             # Check if file exists
             file_exists = FLAGGED_MESSAGES_CSV.exists()
             
             if file_exists:
-                logger.info(f"[CSV] Found existing dataset file: {FLAGGED_MESSAGES_CSV}")
-                # Verify file is readable
-                with open(FLAGGED_MESSAGES_CSV, 'r', encoding='utf-8', newline='') as f:
-                    reader = csv.reader(f)
-                    row_count = sum(1 for row in reader)
-                    logger.info(f"[CSV] Dataset contains {row_count} rows (including header)")
-            else:
-                logger.info(f"[CSV] Creating new dataset file: {FLAGGED_MESSAGES_CSV}")
-                # Create file with headers
-                with open(FLAGGED_MESSAGES_CSV, 'w', encoding='utf-8', newline='') as f:
-                    writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-                    headers = [
-                        'timestamp',
-                        'user_id',
-                        'username',
-                        'user_discriminator',
-                        'guild_id',
-                        'guild_name',
-                        'channel_id',
-                        'channel_name',
-                        'message_content',
-                        'confidence',
-                        'detection_reason',
-                        'user_joined_at',
-                        'message_id'
-                    ]
-                    writer.writerow(headers)
-                    logger.info(f"[CSV] Created dataset with headers: {headers}")
+                logger.info("[CSV] Found existing dataset file: %s", FLAGGED_MESSAGES_CSV)
+                stats = self._load_dataset_stats()
+                logger.info("[CSV] Dataset contains %d messages", stats['total_messages'])
+                return stats
+            
+            logger.info("[CSV] Creating new dataset file: %s", FLAGGED_MESSAGES_CSV)
+            # Create file with headers
+            with open(FLAGGED_MESSAGES_CSV, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+                writer.writerow(CSV_HEADERS)
+                file_size = f.tell()
+                logger.info("[CSV] Created dataset with headers: %s", CSV_HEADERS)
+            
+            stats = {'total_messages': 0, 'detection_methods': {}, 'file_size': file_size}
+            self._save_dataset_stats(stats)
+            return stats
                     
         except Exception as e:
-            logger.error(f"[CSV] Error initializing CSV file: {e}", exc_info=True)
+            logger.error("[CSV] Error initializing CSV file: %s", e, exc_info=True)
+            return {'total_messages': 0, 'detection_methods': {}, 'file_size': 0}
+    
+    @staticmethod
+    def _load_dataset_stats() -> dict:
+        """
+        Load the dataset stats sidecar, rebuilding it from the CSV if it is
+        missing, unreadable or out of step with the CSV.
+        
+        The sidecar records the CSV size it describes; a different size means
+        the CSV was edited or pruned by hand, or the bot stopped between a CSV
+        write and the matching sidecar update. The caller must hold CSV_LOCK.
+        """
+        if DATASET_STATS_FILE.exists():
+            try:
+                with open(DATASET_STATS_FILE, 'r', encoding='utf-8') as f:
+                    stats = json.load(f)
+                
+                csv_size = FLAGGED_MESSAGES_CSV.stat().st_size
+                if stats.get('file_size') == csv_size:
+                    return stats
+                
+                logger.info(
+                    "[CSV] %s describes %s bytes but the dataset is %d bytes, rebuilding",
+                    DATASET_STATS_FILE, stats.get('file_size'), csv_size
+                )
+            except Exception as e:
+                logger.error("[CSV] Error reading %s, rebuilding: %s", DATASET_STATS_FILE, e)
+        
+        stats = DatasetLogger._rebuild_dataset_stats()
+        DatasetLogger._save_dataset_stats(stats)
+        return stats
+    
+    @staticmethod
+    def _rebuild_dataset_stats() -> dict:
+        """Recompute dataset stats with a full scan of the CSV (when the sidecar can't be trusted)."""
+        logger.info("[CSV] Rebuilding dataset stats from %s", FLAGGED_MESSAGES_CSV)
+        
+        # Stream the rows and index by column position: no per-row dicts and
+        # memory proportional to the number of distinct reasons only
+        detection_methods = Counter()
+        total_messages = 0
+        with open(FLAGGED_MESSAGES_CSV, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            reason_column = header.index('detection_reason') if 'detection_reason' in header else None
+            
+            for row in reader:
+                total_messages += 1
+                if reason_column is not None and reason_column < len(row):
+                    detection_methods[row[reason_column]] += 1
+                else:
+                    detection_methods['Unknown'] += 1
+        
+        return {
+            'total_messages': total_messages,
+            'detection_methods': dict(detection_methods),
+            'file_size': FLAGGED_MESSAGES_CSV.stat().st_size
+        }
+    
+    @staticmethod
+    def _save_dataset_stats(stats: dict):
+        """Atomically replace the dataset stats sidecar."""
+        tmp_file = DATASET_STATS_FILE.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(stats, f)
+        os.replace(tmp_file, DATASET_STATS_FILE)
     
     def log_flagged_message(
         self,
         message: discord.Message,
         confidence: float,
         reason: str,
-        user_joined_at: str
+        user_joined_at: str,
+        detected_at: str
     ):
         """
         Log a flagged message to the CSV dataset.
@@ -84,15 +323,15 @@ class DatasetLogger:
             confidence: Detection confidence score (0.0 to 1.0)
             reason: Reason for detection (e.g., "ML Detection", "Pattern Detection")
             user_joined_at: When the user joined the server (formatted string)
+            detected_at: When the message was flagged (formatted string)
         """
         try:
-            logger.info(f"[CSV] Preparing to log message from {message.author.name} to dataset")
+            logger.info("[CSV] Preparing to log message from %s to dataset", message.author.name)
             
             # Prepare data row
-            timestamp = datetime.now(LOCAL_TZ).strftime("%Y-%m-%d %H:%M:%S %Z")
-            
+            content = message.content
             row = [
-                timestamp,
+                detected_at,
                 str(message.author.id),
                 message.author.name,
                 str(message.author.discriminator),
@@ -100,35 +339,63 @@ class DatasetLogger:
                 message.guild.name if message.guild else "DM",
                 str(message.channel.id),
                 message.channel.name if hasattr(message.channel, 'name') else "Unknown",
-                message.content,  # CSV writer will handle escaping
+                content if len(content) <= MAX_CONTENT_LENGTH else content[:MAX_CONTENT_LENGTH],
                 f"{confidence:.4f}",
                 reason,
                 user_joined_at,
                 str(message.id)
             ]
             
-            logger.debug(f"[CSV] Row data prepared: user={message.author.name}, confidence={confidence:.4f}")
+            logger.debug("[CSV] Row data prepared: user=%s, confidence=%.4f", message.author.name, confidence)
             
-            # Thread-safe write to CSV
-            with CSV_LOCK:
-                logger.debug(f"[CSV] Acquired file lock, writing to {FLAGGED_MESSAGES_CSV}")
-                with open(FLAGGED_MESSAGES_CSV, 'a', encoding='utf-8', newline='') as f:
-                    writer = csv.writer(f, quoting=csv.QUOTE_ALL)
-                    writer.writerow(row)
-                    logger.info(f"[CSV] Successfully logged message to dataset")
-                    
-            # Log file size for monitoring
-            file_size = FLAGGED_MESSAGES_CSV.stat().st_size
-            logger.debug(f"[CSV] Current dataset file size: {file_size:,} bytes")
+            if self._queue is None:
+                self._write_rows([row])
+                return
+            
+            # Never block the event loop on disk; drop the row if the writer is behind
+            try:
+                self._queue.put_nowait(row)
+            except asyncio.QueueFull:
+                self._dropped += 1
+                logger.warning("[CSV] Write queue full, dropped row (%d dropped in total)", self._dropped)
             
         except Exception as e:
-            logger.error(f"[CSV] Error logging to dataset: {e}", exc_info=True)
+            logger.error("[CSV] Error logging to dataset: %s", e, exc_info=True)
+    
+    def _publish_stats(self):
+        """Replace the snapshot returned by get_stats(); the caller holds CSV_LOCK."""
+        stats = self._dataset_stats
+        self._stats_snapshot = {
+            'exists': stats['file_size'] > 0,
+            'total_messages': stats['total_messages'],
+            'file_size': stats['file_size'],
+            'file_path': str(FLAGGED_MESSAGES_CSV),
+            'detection_methods': dict(stats['detection_methods'])
+        }
+    
+    def get_stats(self) -> dict:
+        """
+        Get statistics about the dataset from memory.
+        
+        Returns the snapshot published by the writer after its last batch, so it
+        never waits on CSV_LOCK or touches the disk and is safe to call from the
+        event loop. Same keys as get_dataset_stats().
+        
+        Returns:
+            Dictionary with dataset statistics
+        """
+        return self._stats_snapshot
     
     @staticmethod
     def get_dataset_stats() -> dict:
         """
         Get statistics about the dataset.
         
+        Reads the small stats sidecar kept up to date by the writer instead of
+        scanning the CSV, unless the sidecar no longer matches the CSV. This
+        waits on CSV_LOCK and may rescan the CSV, so code running on the event
+        loop should use a logger instance's get_stats() instead.
+        
         Returns:
             Dictionary with dataset statistics
         """
@@ -141,30 +408,19 @@ class DatasetLogger:
                     'detection_methods': {}
                 }
             
-            # Read dataset stats
-            with open(FLAGGED_MESSAGES_CSV, 'r', encoding='utf-8', newline='') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            
-            total_messages = len(rows)
-            file_size = FLAGGED_MESSAGES_CSV.stat().st_size
-            
-            # Get detection method breakdown
-            detection_methods = {}
-            for row in rows:
-                method = row.get('detection_reason', 'Unknown')
-                detection_methods[method] = detection_methods.get(method, 0) + 1
+            with CSV_LOCK:
+                stats = DatasetLogger._load_dataset_stats()
             
             return {
                 'exists': True,
-                'total_messages': total_messages,
-                'file_size': file_size,
+                'total_messages': stats['total_messages'],
+                'file_size': stats['file_size'],
                 'file_path': str(FLAGGED_MESSAGES_CSV),
-                'detection_methods': detection_methods
+                'detection_methods': stats['detection_methods']
             }
             
         except Exception as e:
-            logger.error(f"[CSV] Error reading dataset stats: {e}", exc_info=True)
+            logger.error("[CSV] Error reading dataset stats: %s", e, exc_info=True)
             return {
                 'exists': False,
                 'total_messages': 0,
@@ -7,8 +7,8 @@ def setup_logger(name: str) -> logging.Logger:
     """Setup a logger with proper formatting."""
     logger = logging.getLogger(name)
     
-    # Set level based on environment
-    level = logging.DEBUG if Config.ENVIRONMENT == 'development' else logging.INFO
+    # Set level from LOG_LEVEL (DEBUG in development, WARNING in production by default)
+    level = getattr(logging, Config.LOG_LEVEL, logging.INFO)
     logger.setLevel(level)
     
     # Console handler
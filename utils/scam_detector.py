@@ -1,7 +1,12 @@
 from transformers import pipeline
+import logging
 import re
 from typing import Tuple
 from config import Config
+from utils.logger import setup_logger
+
+# Initialize logger
+logger = setup_logger(__name__)
 
 
 class ScamDetector:
@@ -57,13 +62,17 @@ class ScamDetector:
         }
         label = label_map.get(label, label).upper()
 
-        # DEBUG OUTPUT
-        print(f"\n[DETECTOR] Original: {text[:80]}")
-        print(f"[DETECTOR] Cleaned: {cleaned_text[:80]}")
-        print(f"[DETECTOR] Label: {label} | Score: {score:.4f} | Suspicious: {has_suspicious}")
-        print(f"[DETECTOR] Threshold: {Config.SCAM_THRESHOLD}")
-        print(f"[DETECTOR] Check 1 (label=SPAM AND score > threshold): {label == 'SPAM'} and {score > Config.SCAM_THRESHOLD}")
-        print(f"[DETECTOR] Check 2 (has suspicious patterns): {has_suspicious}\n")
+        # DEBUG OUTPUT (lazily formatted, skipped entirely unless debug logging is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DETECTOR] Original: %.80s", text)
+            logger.debug("[DETECTOR] Cleaned: %.80s", cleaned_text)
+            logger.debug("[DETECTOR] Label: %s | Score: %.4f | Suspicious: %s", label, score, has_suspicious)
+            logger.debug("[DETECTOR] Threshold: %s", Config.SCAM_THRESHOLD)
+            logger.debug(
+                "[DETECTOR] Check 1 (label=SPAM AND score > threshold): %s and %s",
+                label == 'SPAM', score > Config.SCAM_THRESHOLD
+            )
+            logger.debug("[DETECTOR] Check 2 (has suspicious patterns): %s", has_suspicious)
 
         # Determine if it's a scam
         is_scam = False
@@ -138,9 +147,9 @@ class ScamDetector:
             if re.search(pattern, text_lower, re.IGNORECASE):
                 matched_patterns.append(pattern[:50])
 
-        if matched_patterns:
-            print(f"[PATTERNS MATCHED] {len(matched_patterns)} pattern(s):")
+        if matched_patterns and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[PATTERNS MATCHED] %d pattern(s):", len(matched_patterns))
             for p in matched_patterns[:3]:
-                print(f"  - {p}")
+                logger.debug("  - %s", p)
 
         return len(matched_patterns) > 0
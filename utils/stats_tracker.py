@@ -1,103 +1,357 @@
 import psutil
+import array
+import asyncio
+import atexit
 import json
+import os
+import threading
 from pathlib import Path
-from datetime import datetime, timedelta
-import pytz
+from time import monotonic, time
+from typing import List, Optional
+from datetime import datetime, timezone
 
 from utils.logger import setup_logger
 from utils.dataset_logger import DatasetLogger
 
-logger = setup_logger(__name__)
+# orjson is optional; it serializes the stats file several times faster than the stdlib
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+    _loads = json.loads
 
-# Timezone
-LOCAL_TZ = pytz.timezone('America/Edmonton')
+logger = setup_logger(__name__)
 
-# Persistent stats file (lightweight JSON)
+# Persistent stats file (lightweight JSON). Increments only touch memory; the
+# file is rewritten in one atomic replace when a flush is due (see below)
 STATS_FILE = Path("data/bot_stats.json")
 
+# Persist overall stats after this many unsaved increments...
+FLUSH_EVERY = 100
+# ...or once this many seconds have passed since the last save
+FLUSH_INTERVAL_S = 30
+
+# Seconds between background CPU usage samples
+CPU_SAMPLE_INTERVAL_S = 1
+
+# Seconds a memory/disk usage snapshot is reused before querying the OS again
+SYSTEM_STATS_TTL_S = 2
+
+# Seconds a dataset stats snapshot is reused before reading the sidecar again
+DATASET_STATS_TTL_S = 5
+
+# Slots in StatsTracker._c: a session and an overall (total) value per counter
+_ANALYZED_S, _ANALYZED_T, _FLAGGED_S, _FLAGGED_T, _FALSE_S, _FALSE_T = range(6)
+
+# Bytes per GiB, for the memory/disk figures in get_system_stats()
+GIB = 1 << 30
+
+# Minimum seconds between repeated error logs from the save and system-stats paths
+ERROR_LOG_INTERVAL_S = 60
+
 
 class StatsTracker:
     """Track bot statistics with hybrid storage: persistent overall + session stats."""
     
-    def __init__(self):
-        """Initialize the stats tracker."""
-        self.session_start_time = datetime.now(LOCAL_TZ)
+    # Fixed attribute layout: no per-instance __dict__, and counter reads are slot lookups
+    __slots__ = (
+        'session_start_time', '_c',
+        '_first_started_epoch', '_last_updated_epoch', '_stats_doc',
+        '_changes', '_saved_changes', '_save_lock', '_last_flush', '_flush_task',
+        '_last_save_error_log', '_last_system_error_log',
+        '_proc', '_cached_cpu', '_system_stats', '_system_stats_expiry',
+        '_mem_total_gb', '_disk_total_gb',
+        '_dataset_logger', '_dataset_stats', '_dataset_stats_expiry',
+        '_tasks'
+    )
+    
+    def __init__(self, dataset_logger: Optional[DatasetLogger] = None):
+        """
+        Initialize the stats tracker.
         
-        # Session stats (reset on restart)
-        self.session_messages_analyzed = 0
-        self.session_messages_flagged = 0
+        Args:
+            dataset_logger: Running dataset logger whose in-memory stats are reported;
+                without one, dataset stats are read from disk
+        """
+        # Timestamps are kept in UTC; they are only used for differences, never displayed
+        self.session_start_time = datetime.now(timezone.utc)
+        
+        # All six counters (session + overall for analyzed/flagged/false alarms) live
+        # in one unsigned 64-bit array, indexed by the _*_S/_*_T constants above.
+        # Session slots reset on restart; overall slots are loaded from STATS_FILE
+        self._c = array.array('Q', [0] * 6)
+        
+        # Increments are kept in memory and written out in batches. Unsaved
+        # increments are _changes - _saved_changes; each counter has a single
+        # writer (the event loop and the save respectively), so a save finishing
+        # on a worker thread can never lose an increment made meanwhile
+        self._changes = 0
+        self._saved_changes = 0
+        self._last_flush = monotonic()
+        
+        # Serializes saves from the worker thread, reset_overall() and atexit,
+        # which share _stats_doc and the temp file
+        self._save_lock = threading.Lock()
+        
+        # Save running in a worker thread, so at most one is in flight at a time
+        self._flush_task: Optional[asyncio.Task] = None
         
-        # Overall stats (persistent across restarts)
-        self.overall_stats = self._load_overall_stats()
+        # When each recurring failure was last logged, so a full disk or locked
+        # file produces one log line per minute instead of one per message
+        self._last_save_error_log = float('-inf')
+        self._last_system_error_log = float('-inf')
+        
+        # CPU usage is sampled in the background with non-blocking calls; the
+        # first cpu_percent(None) call only primes psutil's counters
+        self._proc = psutil.Process()
+        self._proc.cpu_percent(None)
+        psutil.cpu_percent(None)
+        self._cached_cpu = (0.0, 0.0, monotonic())  # (process %, system %, sampled at)
+        
+        # Last get_system_stats() result and when it stops being reused
+        self._system_stats: dict = {}
+        self._system_stats_expiry = 0.0
+        
+        # Memory and disk capacity don't change while the bot runs, so read them once
+        try:
+            self._mem_total_gb = psutil.virtual_memory().total / GIB
+            self._disk_total_gb = psutil.disk_usage('.').total / GIB
+        except Exception as e:
+            logger.error(f"[STATS] Error reading memory/disk totals: {e}")
+            self._mem_total_gb = self._disk_total_gb = 0.0
+        
+        # Last DatasetLogger.get_dataset_stats() result and when it stops being reused
+        # (only used without a dataset_logger)
+        self._dataset_logger = dataset_logger
+        self._dataset_stats: dict = {}
+        self._dataset_stats_expiry = 0.0
+        
+        # Background tasks (periodic flush, CPU sampler), started by start()
+        self._tasks: List[asyncio.Task] = []
+        
+        # Overall timestamps, stored as epoch seconds rather than ISO strings
+        self._first_started_epoch = time()
+        self._last_updated_epoch = self._first_started_epoch
+        
+        # Serialization dict reused by every save; only its values change
+        self._stats_doc = dict.fromkeys((
+            'total_messages_analyzed', 'total_messages_flagged', 'total_false_alarms',
+            'first_started_epoch', 'last_updated_epoch'
+        ))
+        self._load_overall_stats()
+        atexit.register(self.flush)
         
         logger.info("[STATS] Stats tracker initialized")
-        logger.info(f"[STATS] Overall: {self.overall_stats['total_messages_analyzed']} analyzed, "
-                   f"{self.overall_stats['total_messages_flagged']} flagged, "
-                   f"{self.overall_stats['total_false_alarms']} false alarms")
+        logger.info(f"[STATS] Overall: {self._c[_ANALYZED_T]} analyzed, "
+                   f"{self._c[_FLAGGED_T]} flagged, "
+                   f"{self._c[_FALSE_T]} false alarms")
     
-    def _load_overall_stats(self) -> dict:
+    def _load_overall_stats(self):
         """Load overall stats from JSON file or create new."""
         try:
             if STATS_FILE.exists():
-                with open(STATS_FILE, 'r', encoding='utf-8') as f:
-                    stats = json.load(f)
+                with open(STATS_FILE, 'rb') as f:
+                    stats = _loads(f.read())
                     logger.info(f"[STATS] Loaded overall stats from {STATS_FILE}")
-                    return stats
+                
+                c = self._c
+                c[_ANALYZED_T] = int(stats.get('total_messages_analyzed', 0))
+                c[_FLAGGED_T] = int(stats.get('total_messages_flagged', 0))
+                c[_FALSE_T] = int(stats.get('total_false_alarms', 0))
+                
+                # Older files stored first_started/last_updated as ISO strings
+                self._first_started_epoch = self._read_epoch(stats, 'first_started', self._first_started_epoch)
+                self._last_updated_epoch = self._read_epoch(stats, 'last_updated', self._last_updated_epoch)
             else:
                 # Create new stats file
                 STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
-                default_stats = {
-                    'total_messages_analyzed': 0,
-                    'total_messages_flagged': 0,
-                    'total_false_alarms': 0,
-                    'first_started': datetime.now(LOCAL_TZ).isoformat(),
-                    'last_updated': datetime.now(LOCAL_TZ).isoformat()
-                }
-                self._save_overall_stats(default_stats)
+                self._save_overall_stats()
                 logger.info(f"[STATS] Created new stats file at {STATS_FILE}")
-                return default_stats
         except Exception as e:
             logger.error(f"[STATS] Error loading stats: {e}", exc_info=True)
-            return {
-                'total_messages_analyzed': 0,
-                'total_messages_flagged': 0,
-                'total_false_alarms': 0,
-                'first_started': datetime.now(LOCAL_TZ).isoformat(),
-                'last_updated': datetime.now(LOCAL_TZ).isoformat()
-            }
     
-    def _save_overall_stats(self, stats: dict = None):
+    @staticmethod
+    def _read_epoch(stats: dict, key: str, default: float) -> float:
+        """Read '<key>_epoch' from a loaded stats dict, falling back to a legacy ISO '<key>'."""
+        epoch = stats.get(f'{key}_epoch')
+        if epoch is not None:
+            return epoch
+        
+        try:
+            return datetime.fromisoformat(stats[key]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return default
+    
+    def _save_overall_stats(self):
         """Save overall stats to JSON file."""
+        with self._save_lock:
+            self._save_overall_stats_locked()
+    
+    def _save_overall_stats_locked(self):
+        """Write the stats file; the caller holds _save_lock."""
         try:
-            if stats is None:
-                stats = self.overall_stats
+            # Increments that land while the file is written stay unsaved
+            pending = self._changes
+            self._last_updated_epoch = time()
+            c = self._c
+            stats = self._stats_doc
+            stats['total_messages_analyzed'] = c[_ANALYZED_T]
+            stats['total_messages_flagged'] = c[_FLAGGED_T]
+            stats['total_false_alarms'] = c[_FALSE_T]
+            stats['first_started_epoch'] = self._first_started_epoch
+            stats['last_updated_epoch'] = self._last_updated_epoch
             
-            stats['last_updated'] = datetime.now(LOCAL_TZ).isoformat()
-            
-            with open(STATS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(stats, f, indent=2)
+            # Write to a sibling file and rename over the old one, so a crash
+            # mid-write never leaves a truncated stats file behind
+            tmp_file = STATS_FILE.with_suffix('.json.tmp')
+            with open(tmp_file, 'wb') as f:
+                f.write(_dumps(stats))
+            os.replace(tmp_file, STATS_FILE)
             
+            self._saved_changes = pending
+            self._last_flush = monotonic()
             logger.debug(f"[STATS] Saved overall stats to {STATS_FILE}")
         except Exception as e:
-            logger.error(f"[STATS] Error saving stats: {e}", exc_info=True)
+            now = monotonic()
+            if now - self._last_save_error_log > ERROR_LOG_INTERVAL_S:
+                logger.error(f"[STATS] Error saving stats: {e}")
+                self._last_save_error_log = now
+    
+    @property
+    def session_messages_analyzed(self) -> int:
+        return self._c[_ANALYZED_S]
+    
+    @property
+    def session_messages_flagged(self) -> int:
+        return self._c[_FLAGGED_S]
+    
+    @property
+    def session_false_alarms(self) -> int:
+        return self._c[_FALSE_S]
+    
+    @property
+    def total_messages_analyzed(self) -> int:
+        return self._c[_ANALYZED_T]
+    
+    @property
+    def total_messages_flagged(self) -> int:
+        return self._c[_FLAGGED_T]
+    
+    @property
+    def total_false_alarms(self) -> int:
+        return self._c[_FALSE_T]
+    
+    def reset_session(self):
+        """Reset session stats and restart the session uptime clock."""
+        self.session_start_time = datetime.now(timezone.utc)
+        c = self._c
+        c[_ANALYZED_S] = c[_FLAGGED_S] = c[_FALSE_S] = 0
+    
+    def reset_overall(self):
+        """Reset overall stats to zero and persist them immediately."""
+        # Zero and save under the lock, so a save already running in the worker
+        # thread lands first and never writes a mix of old and new totals
+        with self._save_lock:
+            c = self._c
+            c[_ANALYZED_T] = c[_FLAGGED_T] = c[_FALSE_T] = 0
+            self._first_started_epoch = time()
+            self._save_overall_stats_locked()
+    
+    def flush(self):
+        """Persist overall stats if anything changed since the last save."""
+        if self._changes != self._saved_changes:
+            self._save_overall_stats()
+    
+    def _maybe_flush(self):
+        """Persist overall stats once enough increments or time have accumulated."""
+        if self._changes - self._saved_changes >= FLUSH_EVERY or monotonic() - self._last_flush >= FLUSH_INTERVAL_S:
+            self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """Save overall stats off the event loop, or inline when no loop is running."""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_overall_stats()
+            return
+        
+        self._flush_task = loop.create_task(self._async_flush(), name="stats-save")
+    
+    async def _async_flush(self):
+        """Run _save_overall_stats in a worker thread so disk I/O never blocks the loop."""
+        await asyncio.to_thread(self._save_overall_stats)
+    
+    def start(self):
+        """Start the background tasks that persist overall stats and sample CPU usage."""
+        if self._tasks:
+            return
+        
+        self._tasks = [
+            asyncio.create_task(self._periodic_flush(), name="stats-flush"),
+            asyncio.create_task(self._sample_cpu(), name="stats-cpu-sampler")
+        ]
+    
+    async def close(self):
+        """Stop the background tasks and persist any pending increments."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        self.flush()
+    
+    async def _periodic_flush(self):
+        """Save pending increments every FLUSH_INTERVAL_S, even when traffic is quiet."""
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_S)
+            if self._changes != self._saved_changes:
+                self._schedule_flush()
+    
+    async def _sample_cpu(self):
+        """Refresh the cached CPU usage every CPU_SAMPLE_INTERVAL_S without blocking."""
+        while True:
+            await asyncio.sleep(CPU_SAMPLE_INTERVAL_S)
+            try:
+                self._cached_cpu = (self._proc.cpu_percent(None), psutil.cpu_percent(None), monotonic())
+            except Exception as e:
+                now = monotonic()
+                if now - self._last_system_error_log > ERROR_LOG_INTERVAL_S:
+                    logger.error(f"[STATS] Error sampling CPU usage: {e}")
+                    self._last_system_error_log = now
     
     def increment_analyzed(self):
         """Increment the count of messages analyzed (both session and overall)."""
-        self.session_messages_analyzed += 1
-        self.overall_stats['total_messages_analyzed'] += 1
-        self._save_overall_stats()
+        c = self._c
+        c[_ANALYZED_S] += 1
+        c[_ANALYZED_T] += 1
+        self._changes += 1
+        self._maybe_flush()
     
     def increment_flagged(self):
         """Increment the count of messages flagged (both session and overall)."""
-        self.session_messages_flagged += 1
-        self.overall_stats['total_messages_flagged'] += 1
-        self._save_overall_stats()
+        c = self._c
+        c[_FLAGGED_S] += 1
+        c[_FLAGGED_T] += 1
+        self._changes += 1
+        self._maybe_flush()
     
     def increment_false_alarm(self):
         """Increment the count of false alarms reported (both session and overall)."""
-        self.overall_stats['total_false_alarms'] += 1
-        self._save_overall_stats()
-        logger.info(f"[STATS] False alarm reported. Total: {self.overall_stats['total_false_alarms']}")
+        c = self._c
+        c[_FALSE_S] += 1
+        c[_FALSE_T] += 1
+        self._changes += 1
+        self._maybe_flush()
+        logger.info(f"[STATS] False alarm reported. Total: {c[_FALSE_T]}")
     
     def get_session_uptime(self) -> str:
         """
@@ -106,19 +360,20 @@ class StatsTracker:
         Returns:
             Formatted uptime string (e.g., "2 hours, 45 minutes")
         """
-        uptime = datetime.now(LOCAL_TZ) - self.session_start_time
+        return self._session_uptime(datetime.now(timezone.utc))
+    
+    def _session_uptime(self, now: datetime) -> str:
+        """Format session uptime as of now."""
+        uptime = now - self.session_start_time
         days = uptime.days
         hours, remainder = divmod(uptime.seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        
-        parts = []
-        if days > 0:
-            parts.append(f"{days} day{'s' if days != 1 else ''}")
-        if hours > 0:
-            parts.append(f"{hours} hour{'s' if hours != 1 else ''}")
-        if minutes > 0:
-            parts.append(f"{minutes} minute{'s' if minutes != 1 else ''}")
+        minutes = remainder // 60
         
+        parts = [
+            f"{n} {unit}{'s' * (n != 1)}"
+            for n, unit in ((days, 'day'), (hours, 'hour'), (minutes, 'minute'))
+            if n > 0
+        ]
         return ", ".join(parts) if parts else "Less than a minute"
     
     def get_total_uptime(self) -> str:
@@ -128,29 +383,41 @@ class StatsTracker:
         Returns:
             Formatted total uptime string
         """
+        return self._total_uptime(datetime.now(timezone.utc))
+    
+    def _total_uptime(self, now: datetime) -> str:
+        """Format total uptime since first bot start as of now."""
+        # Only the conversion can fail, and only for a corrupt value loaded from disk
         try:
-            first_started = datetime.fromisoformat(self.overall_stats['first_started'])
-            total_uptime = datetime.now(LOCAL_TZ) - first_started
-            
-            days = total_uptime.days
-            hours, remainder = divmod(total_uptime.seconds, 3600)
-            
-            if days > 0:
-                return f"{days} day{'s' if days != 1 else ''}, {hours} hour{'s' if hours != 1 else ''}"
-            else:
-                return f"{hours} hour{'s' if hours != 1 else ''}"
-        except:
+            first_started = datetime.fromtimestamp(self._first_started_epoch, timezone.utc)
+        except (TypeError, ValueError, OverflowError, OSError):
             return "Unknown"
+        
+        total_uptime = now - first_started
+        days = total_uptime.days
+        hours = total_uptime.seconds // 3600
+        
+        if days > 0:
+            return f"{days} day{'s' if days != 1 else ''}, {hours} hour{'s' if hours != 1 else ''}"
+        else:
+            return f"{hours} hour{'s' if hours != 1 else ''}"
     
     def get_session_messages_per_hour(self) -> float:
-        """Calculate session messages analyzed per hour."""
-        uptime = datetime.now(LOCAL_TZ) - self.session_start_time
-        hours = uptime.total_seconds() / 3600
+        """Calculate session messages analyzed per hour (0.0 early if nothing was analyzed yet)."""
+        return self._session_messages_per_hour(datetime.now(timezone.utc))
+    
+    def _session_messages_per_hour(self, now: datetime) -> float:
+        """Calculate session messages analyzed per hour as of now."""
+        analyzed = self.session_messages_analyzed
+        if analyzed == 0:
+            return 0.0
+        
+        hours = (now - self.session_start_time).total_seconds() / 3600
         
         if hours < 0.01:
             return 0.0
         
-        return self.session_messages_analyzed / hours
+        return analyzed / hours
     
     def get_session_detection_rate(self) -> float:
         """Calculate session detection rate (flagged/analyzed)."""
@@ -161,19 +428,19 @@ class StatsTracker:
     
     def get_overall_detection_rate(self) -> float:
         """Calculate overall detection rate (flagged/analyzed)."""
-        total = self.overall_stats['total_messages_analyzed']
+        total = self._c[_ANALYZED_T]
         if total == 0:
             return 0.0
         
-        return (self.overall_stats['total_messages_flagged'] / total) * 100
+        return (self._c[_FLAGGED_T] / total) * 100
     
     def get_overall_accuracy_estimate(self) -> float:
         """Estimate overall accuracy based on false alarms reported."""
-        flagged = self.overall_stats['total_messages_flagged']
+        flagged = self._c[_FLAGGED_T]
         if flagged == 0:
             return 100.0
         
-        false_alarms = self.overall_stats['total_false_alarms']
+        false_alarms = self._c[_FALSE_T]
         true_positives = flagged - false_alarms
         
         if true_positives < 0:
@@ -181,62 +448,99 @@ class StatsTracker:
         
         return (true_positives / flagged) * 100
     
-    @staticmethod
-    def get_system_stats() -> dict:
-        """Get system resource usage statistics."""
+    def get_system_stats(self) -> dict:
+        """Get system resource usage statistics (CPU figures come from the background sampler)."""
+        # Back-to-back queries reuse the last snapshot instead of re-reading procfs/statvfs
+        if monotonic() < self._system_stats_expiry:
+            return self._system_stats
+        
         try:
-            process = psutil.Process()
-            
-            cpu_percent = process.cpu_percent(interval=0.1)
-            memory_info = process.memory_info()
+            cpu_percent, system_cpu, _ = self._cached_cpu
+            memory_info = self._proc.memory_info()
             memory_mb = memory_info.rss / 1024 / 1024
             
-            system_cpu = psutil.cpu_percent(interval=0.1)
             system_memory = psutil.virtual_memory()
             disk = psutil.disk_usage('.')
             
-            return {
+            self._system_stats = {
                 'process_cpu_percent': cpu_percent,
                 'process_memory_mb': memory_mb,
                 'system_cpu_percent': system_cpu,
                 'system_memory_percent': system_memory.percent,
-                'system_memory_total_gb': system_memory.total / 1024 / 1024 / 1024,
-                'system_memory_used_gb': system_memory.used / 1024 / 1024 / 1024,
-                'disk_total_gb': disk.total / 1024 / 1024 / 1024,
-                'disk_used_gb': disk.used / 1024 / 1024 / 1024,
+                'system_memory_total_gb': self._mem_total_gb,
+                'system_memory_used_gb': system_memory.used / GIB,
+                'disk_total_gb': self._disk_total_gb,
+                'disk_used_gb': disk.used / GIB,
                 'disk_percent': disk.percent
             }
+            self._system_stats_expiry = monotonic() + SYSTEM_STATS_TTL_S
+            return self._system_stats
         except Exception as e:
-            logger.error(f"[STATS] Error getting system stats: {e}", exc_info=True)
+            now = monotonic()
+            if now - self._last_system_error_log > ERROR_LOG_INTERVAL_S:
+                logger.error(f"[STATS] Error getting system stats: {e}")
+                self._last_system_error_log = now
             return {}
     
-    def get_comprehensive_stats(self) -> dict:
-        """Get all statistics in one dictionary."""
-        dataset_stats = DatasetLogger.get_dataset_stats()
+    def get_dataset_stats(self) -> dict:
+        """
+        Get dataset statistics without blocking the event loop.
+        
+        Served from the dataset logger's in-memory snapshot when one was given;
+        otherwise the on-disk stats are read, reusing the result for DATASET_STATS_TTL_S.
+        """
+        if self._dataset_logger is not None:
+            return self._dataset_logger.get_stats()
+        
+        now = monotonic()
+        if now >= self._dataset_stats_expiry:
+            self._dataset_stats = DatasetLogger.get_dataset_stats()
+            self._dataset_stats_expiry = now + DATASET_STATS_TTL_S
+        return self._dataset_stats
+    
+    def get_comprehensive_stats(self, include_dataset: bool = True) -> dict:
+        """
+        Get all statistics in one dictionary.
+        
+        Args:
+            include_dataset: Whether to include the dataset_* and detection_methods keys
+        
+        Returns:
+            Dictionary with session, overall, system and (optionally) dataset stats
+        """
         system_stats = self.get_system_stats()
+        now = datetime.now(timezone.utc)
         
-        return {
+        stats = {
             # Session stats
-            'session_uptime': self.get_session_uptime(),
+            'session_uptime': self._session_uptime(now),
             'session_messages_analyzed': self.session_messages_analyzed,
             'session_messages_flagged': self.session_messages_flagged,
             'session_detection_rate': self.get_session_detection_rate(),
-            'session_messages_per_hour': self.get_session_messages_per_hour(),
+            'session_messages_per_hour': self._session_messages_per_hour(now),
             
             # Overall stats
-            'total_uptime': self.get_total_uptime(),
-            'total_messages_analyzed': self.overall_stats['total_messages_analyzed'],
-            'total_messages_flagged': self.overall_stats['total_messages_flagged'],
-            'total_false_alarms': self.overall_stats['total_false_alarms'],
+            'total_uptime': self._total_uptime(now),
+            'total_messages_analyzed': self._c[_ANALYZED_T],
+            'total_messages_flagged': self._c[_FLAGGED_T],
+            'total_false_alarms': self._c[_FALSE_T],
             'total_detection_rate': self.get_overall_detection_rate(),
             'overall_accuracy': self.get_overall_accuracy_estimate(),
-            
-            # Dataset stats
-            'dataset_total': dataset_stats.get('total_messages', 0),
-            'dataset_size_bytes': dataset_stats.get('file_size', 0),
-            'dataset_size_mb': dataset_stats.get('file_size', 0) / 1024 / 1024,
-            'detection_methods': dataset_stats.get('detection_methods', {}),
+            'last_updated_iso': datetime.fromtimestamp(
+                self._last_updated_epoch, timezone.utc
+            ).isoformat(),
             
             # System stats
             'system': system_stats
-        }
\ No newline at end of file
+        }
+        
+        if include_dataset:
+            dataset_stats = self.get_dataset_stats()
+            stats.update({
+                'dataset_total': dataset_stats.get('total_messages', 0),
+                'dataset_size_bytes': dataset_stats.get('file_size', 0),
+                'dataset_size_mb': dataset_stats.get('file_size', 0) / 1024 / 1024,
+                'detection_methods': dataset_stats.get('detection_methods', {})
+            })
+        
+        return stats
\ No newline at end of file